@@ -4,331 +4,502 @@ Fraud Detection Demo - AI + Blockchain Crop Insurance
 Demonstrates how the system detects various types of farmer fraud
 """
 
+import io
 import json
 import random
+import sys
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
+from enum import IntEnum
+
+import numpy as np
+
+import pandas as pd
+
+try:
+    from numba import njit, prange
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+    prange = range
+
+class Rule(IntEnum):
+    """Index of each fraud rule's weight in WEIGHTS"""
+    SUSPICIOUS_HARVEST = 0
+    MULTIPLE_CLAIMS = 1
+    CLAIM_BEFORE_EXPIRY = 2
+    DUPLICATE_COORDS = 3
+    AREA_MISMATCH = 4
+    INVALID_COORDS = 5
+    DROUGHT_RAIN = 6
+    FLOOD_NO_RAIN = 7
+    FROST_HIGH_TEMP = 8
+    HIGH_CLAIM_FREQUENCY = 9
+    CONSISTENT_DAMAGE = 10
+    LARGE_CLAIM_AMOUNTS = 11
+    ARTIFICIAL_DAMAGE = 12
+    SUDDEN_NDVI_DROP = 13
+
+WEIGHTS = np.array([0.3, 0.4, 0.2, 0.6, 0.4, 0.5, 0.7, 0.7, 0.6, 0.5, 0.3, 0.4, 0.8, 0.6], dtype=np.float64)
+WEIGHTS.flags.writeable = False
+
+def _code_lookup(names):
+    """Map lower-case names and their codes to codes; IntEnum members hash and compare as their codes"""
+    lookup = {name: code for code, name in enumerate(names)}
+    lookup.update({code: code for code in range(len(names))})
+    return lookup
+
+# String fields are encoded to small ints before entering the kernel (-1 = unknown).
+# The codes match fraud_detection.CropType and fraud_detection.DamageType, so their
+# members are accepted too, as with the engine's own lookup tables
+_CROP_CODES = _code_lookup(('wheat', 'rice', 'cotton', 'sugarcane'))
+_DAMAGE_CODES = _code_lookup(('drought', 'flood', 'hail', 'frost', 'pest', 'disease'))
+
+# Weather rule per damage code: (rainfall, temperature) -> contradicts the claim
+_WEATHER_MISMATCH = (
+    lambda rain, temp: rain > 20,   # drought despite rainfall
+    lambda rain, temp: rain < 50,   # flood without heavy rain
+    lambda rain, temp: False,       # hail
+    lambda rain, temp: temp > 5,    # frost at high temperature
+    lambda rain, temp: False,       # pest
+    lambda rain, temp: False        # disease
+)
+_WEATHER_RULE = np.array([
+    WEIGHTS[Rule.DROUGHT_RAIN], WEIGHTS[Rule.FLOOD_NO_RAIN], 0.0, WEIGHTS[Rule.FROST_HIGH_TEMP], 0.0, 0.0
+])
+
+# Fractional limits compared in float32, matching the kernel's input precision
+_AREA_MISMATCH_LIMIT = np.float32(0.3)
+_CLAIM_RATIO_LIMIT = np.float32(0.7)
+
+# Scores equal to a threshold fall into the higher level (searchsorted side='right')
+_RISK_THRESHOLDS = np.array([0.3, 0.6, 0.8])
+_RISK_LEVELS = np.array(['LOW', 'MEDIUM', 'HIGH', 'CRITICAL'])
+
+# Indicator messages by bit position in the kernel's bitmask
+_FRAUD_INDICATORS = (
+    "Suspicious timing pattern detected",
+    "Geospatial data inconsistency",
+    "Weather data mismatch with claimed damage",
+    "Satellite imagery suggests artificial damage",
+    "Unusual behavioral pattern in claim history"
+)
+
+def _score_kernel(crop_code, days, damage_code, rainfall, temperature, has_dup,
+                  area_mismatch, artificial, ndvi_drop, hist_len, hist_claim_ratio):
+    """Score one encoded claim; returns (fraud_score, indicator bitmask)"""
+    harvest_timing = (crop_code == 0 or crop_code == 1) and days > 120
+    timing = (WEIGHTS[Rule.SUSPICIOUS_HARVEST] * harvest_timing +
+              WEIGHTS[Rule.MULTIPLE_CLAIMS] * (hist_len > 1))
+    timing = min(timing, 1.0)
+    
+    geo = (WEIGHTS[Rule.DUPLICATE_COORDS] * has_dup +
+           WEIGHTS[Rule.AREA_MISMATCH] * (area_mismatch > _AREA_MISMATCH_LIMIT))
+    geo = min(geo, 1.0)
+    
+    drought_mismatch = damage_code == 0 and rainfall > 20
+    flood_mismatch = damage_code == 1 and rainfall < 50
+    frost_mismatch = damage_code == 3 and temperature > 5
+    weather = (WEIGHTS[Rule.DROUGHT_RAIN] * drought_mismatch +
+               WEIGHTS[Rule.FLOOD_NO_RAIN] * flood_mismatch +
+               WEIGHTS[Rule.FROST_HIGH_TEMP] * frost_mismatch)
+    weather = min(weather, 1.0)
+    
+    satellite = (WEIGHTS[Rule.ARTIFICIAL_DAMAGE] * artificial +
+                 WEIGHTS[Rule.SUDDEN_NDVI_DROP] * ndvi_drop)
+    satellite = min(satellite, 1.0)
+    
+    behavioral = WEIGHTS[Rule.HIGH_CLAIM_FREQUENCY] * (hist_len > 0 and hist_claim_ratio > _CLAIM_RATIO_LIMIT)
+    behavioral = min(behavioral, 1.0)
+    
+    flags = 0
+    if timing > 0.3:
+        flags |= 1
+    if geo > 0.4:
+        flags |= 2
+    if weather > 0.5:
+        flags |= 4
+    if satellite > 0.5:
+        flags |= 8
+    if behavioral > 0.4:
+        flags |= 16
+    
+    fraud_score = 0.0
+    fraud_score += timing * 0.25
+    fraud_score += geo * 0.25
+    fraud_score += weather * 0.20
+    fraud_score += satellite * 0.20
+    fraud_score += behavioral * 0.10
+    return fraud_score, flags
+
+# Explicit signature compiles eagerly at import (or loads the on-disk cache from
+# __pycache__), so the first detect_fraud call never pays JIT latency
+_SCORE_KERNEL_SIGNATURE = ('Tuple((float64, uint16))'
+                           '(int8, int32, int8, float32, float32, boolean, float32, boolean, boolean, int32, float32)')
+
+if _NUMBA_AVAILABLE:
+    try:
+        _score_kernel = njit(_SCORE_KERNEL_SIGNATURE, cache=True)(_score_kernel)
+    except Exception:
+        _NUMBA_AVAILABLE = False
+
+def score_batch(crop_codes, days, damage_codes, rainfall, temperature, has_dup, area_mismatch,
+                artificial, ndvi_drop, hist_len, hist_ratio, out_scores, out_flags):
+    """Score encoded claim columns in parallel, writing into out_scores / out_flags"""
+    for i in prange(len(crop_codes)):
+        out_scores[i], out_flags[i] = _score_kernel(
+            crop_codes[i], days[i], damage_codes[i], rainfall[i], temperature[i], has_dup[i],
+            area_mismatch[i], artificial[i], ndvi_drop[i], hist_len[i], hist_ratio[i]
+        )
+
+# Claims are independent, so the compiled loop runs across all cores without the GIL
+# (thread count follows NUMBA_NUM_THREADS, which defaults to the core count)
+if _NUMBA_AVAILABLE:
+    score_batch = njit(parallel=True, cache=True)(score_batch)
+
+def decode_indicators(bitmasks):
+    """Expand indicator bitmasks from detect_fraud_batch into lists of messages"""
+    labels = np.array(_FRAUD_INDICATORS)
+    bits = (np.asarray(bitmasks)[:, None] >> np.arange(len(labels))) & 1
+    return [labels[row.astype(bool)].tolist() for row in bits]
+
+def _history_claim_ratio(historical_data):
+    """Share of historical policies that ended in a claim"""
+    if not historical_data:
+        return 0.0
+    return sum(1 for h in historical_data if h.get('claimed')) / len(historical_data)
+
+def _encoded_column(claims_df, name, default, dtype):
+    """Column as a typed array, filled with default when absent or missing"""
+    if name in claims_df:
+        return claims_df[name].fillna(default).to_numpy(dtype=dtype)
+    return np.full(len(claims_df), default, dtype=dtype)
+
+@dataclass(slots=True)
+class ClaimRecord:
+    """Claim fields used by SimpleFraudDetector"""
+    crop_type: str
+    damage_type: str
+    days_since_sowing: int
+    rainfall: float = 0
+    temperature: float = 20
+    has_duplicate_coords: bool = False
+    area_mismatch: float = 0.0
+    artificial_patterns: bool = False
+    sudden_ndvi_drop: bool = False
+    claim_amount: float = 0
+    
+    @classmethod
+    def from_dict(cls, claim_data):
+        """Build a record from a claim dict, ignoring unknown keys"""
+        return cls(**{name: claim_data[name] for name in cls.__dataclass_fields__ if name in claim_data})
 
 class SimpleFraudDetector:
     """Simplified fraud detection engine for demonstration"""
     
-    def __init__(self):
-        self.fraud_patterns = {
-            'timing': {
-                'suspicious_harvest_timing': 0.3,
-                'multiple_claims_short_period': 0.4,
-                'claim_just_before_expiry': 0.2
-            },
-            'geospatial': {
-                'duplicate_coordinates': 0.6,
-                'area_mismatch': 0.4,
-                'invalid_coordinates': 0.5
-            },
-            'weather': {
-                'drought_with_rainfall': 0.7,
-                'flood_without_rain': 0.7,
-                'frost_high_temp': 0.6
-            },
-            'behavioral': {
-                'high_claim_frequency': 0.5,
-                'consistent_damage_type': 0.3,
-                'large_claim_amounts': 0.4
-            },
-            'satellite': {
-                'artificial_damage_pattern': 0.8,
-                'sudden_ndvi_drop': 0.6,
-                'geometric_patterns': 0.7
-            }
-        }
-    
-    def detect_fraud(self, farmer_data, claim_data, historical_data):
-        """Main fraud detection function"""
-        fraud_score = 0.0
-        fraud_indicators = []
+    def detect_fraud(self, farmer_data, claim, historical_data):
+        """Main fraud detection function (claim is a ClaimRecord or a claim dict)"""
+        if isinstance(claim, dict):
+            claim = ClaimRecord.from_dict(claim)
         
-        # Analyze timing patterns
-        timing_score = self.analyze_timing(claim_data, historical_data)
-        if timing_score > 0.3:
-            fraud_indicators.append("Suspicious timing pattern detected")
-        fraud_score += timing_score * 0.25
-        
-        # Analyze geospatial data
-        geo_score = self.analyze_geospatial(claim_data)
-        if geo_score > 0.4:
-            fraud_indicators.append("Geospatial data inconsistency")
-        fraud_score += geo_score * 0.25
-        
-        # Analyze weather consistency
-        weather_score = self.analyze_weather(claim_data)
-        if weather_score > 0.5:
-            fraud_indicators.append("Weather data mismatch with claimed damage")
-        fraud_score += weather_score * 0.20
-        
-        # Analyze satellite patterns
-        satellite_score = self.analyze_satellite(claim_data)
-        if satellite_score > 0.5:
-            fraud_indicators.append("Satellite imagery suggests artificial damage")
-        fraud_score += satellite_score * 0.20
-        
-        # Analyze behavioral patterns
-        behavioral_score = self.analyze_behavior(farmer_data, historical_data)
-        if behavioral_score > 0.4:
-            fraud_indicators.append("Unusual behavioral pattern in claim history")
-        fraud_score += behavioral_score * 0.10
-        
-        # Determine risk level
-        if fraud_score < 0.3:
-            risk_level = 'LOW'
-        elif fraud_score < 0.6:
-            risk_level = 'MEDIUM'
-        elif fraud_score < 0.8:
-            risk_level = 'HIGH'
+        if _NUMBA_AVAILABLE:
+            fraud_score, flags = _score_kernel(
+                _CROP_CODES.get(claim.crop_type, -1),
+                int(claim.days_since_sowing),
+                _DAMAGE_CODES.get(claim.damage_type, -1),
+                float(claim.rainfall),
+                float(claim.temperature),
+                bool(claim.has_duplicate_coords),
+                float(claim.area_mismatch),
+                bool(claim.artificial_patterns),
+                bool(claim.sudden_ndvi_drop),
+                len(historical_data),
+                _history_claim_ratio(historical_data)
+            )
         else:
-            risk_level = 'CRITICAL'
-        
-        return {
-            'fraud_score': round(fraud_score, 2),
-            'risk_level': risk_level,
-            'fraud_indicators': fraud_indicators,
-            'requires_field_verification': fraud_score > 0.6,
-            'auto_reject': fraud_score > 0.85
-        }
-    
-    def analyze_timing(self, claim_data, historical_data):
-        """Analyze timing patterns for fraud detection"""
-        score = 0.0
-        
-        # Mock analysis based on crop type and timing
-        if claim_data['crop_type'] in ['wheat', 'rice'] and claim_data['days_since_sowing'] > 120:
-            score += self.fraud_patterns['timing']['suspicious_harvest_timing']
-        
-        # Check for multiple recent claims
-        if len(historical_data) > 1:
-            score += self.fraud_patterns['timing']['multiple_claims_short_period']
-        
-        return min(score, 1.0)
-    
-    def analyze_geospatial(self, claim_data):
-        """Analyze geospatial data for inconsistencies"""
-        score = 0.0
+            fraud_score, flags = self._score_all(claim, farmer_data, historical_data)
         
-        # Simulate duplicate coordinate detection
-        if claim_data.get('has_duplicate_coords', False):
-            score += self.fraud_patterns['geospatial']['duplicate_coordinates']
+        return self._build_result(
+            fraud_score,
+            [message for bit, message in enumerate(_FRAUD_INDICATORS) if flags & (1 << bit)]
+        )
+    
+    def detect_fraud_batch(self, claims_df):
+        """
+        Score many claims in one call
         
-        # Simulate area mismatch
-        if claim_data.get('area_mismatch', 0) > 0.3:
-            score += self.fraud_patterns['geospatial']['area_mismatch']
+        claims_df has one row per claim with ClaimRecord columns, plus optional
+        history_length and history_claim_ratio describing each farmer's history.
+        """
+        n = len(claims_df)
+        fraud_scores = np.empty(n, dtype=np.float64)
+        flags = np.empty(n, dtype=np.uint16)
         
-        return min(score, 1.0)
-    
-    def analyze_weather(self, claim_data):
-        """Analyze weather consistency with claimed damage"""
-        score = 0.0
-        damage_type = claim_data['damage_type']
+        score_batch(
+            claims_df['crop_type'].map(_CROP_CODES).fillna(-1).to_numpy(dtype=np.int8),
+            claims_df['days_since_sowing'].to_numpy(dtype=np.int32),
+            claims_df['damage_type'].map(_DAMAGE_CODES).fillna(-1).to_numpy(dtype=np.int8),
+            _encoded_column(claims_df, 'rainfall', 0, np.float32),
+            _encoded_column(claims_df, 'temperature', 20, np.float32),
+            _encoded_column(claims_df, 'has_duplicate_coords', False, np.bool_),
+            _encoded_column(claims_df, 'area_mismatch', 0, np.float32),
+            _encoded_column(claims_df, 'artificial_patterns', False, np.bool_),
+            _encoded_column(claims_df, 'sudden_ndvi_drop', False, np.bool_),
+            _encoded_column(claims_df, 'history_length', 0, np.int32),
+            _encoded_column(claims_df, 'history_claim_ratio', 0, np.float32),
+            fraud_scores,
+            flags
+        )
         
-        # Mock weather inconsistency detection
-        weather_inconsistencies = {
-            'drought': claim_data.get('rainfall', 0) > 20,
-            'flood': claim_data.get('rainfall', 0) < 50,
-            'frost': claim_data.get('temperature', 20) > 5
-        }
+        return pd.DataFrame({
+            # Python's round(), as in _build_result; ndarray.round() differs on ties such as 0.155
+            'fraud_score': [round(score, 2) for score in fraud_scores.tolist()],
+            'risk_level': _RISK_LEVELS[np.searchsorted(_RISK_THRESHOLDS, fraud_scores, side='right')],
+            'indicators_bitmask': flags,
+            'requires_field_verification': fraud_scores > 0.6,
+            'auto_reject': fraud_scores > 0.85
+        }, index=claims_df.index)
+    
+    def _score_all(self, claim, farmer_data, historical_data):
+        """Interpreted single-pass scoring used when Numba is not installed"""
+        crop = _CROP_CODES.get(claim.crop_type, -1)
+        days = claim.days_since_sowing
+        dmg = _DAMAGE_CODES.get(claim.damage_type, -1)
+        rain = claim.rainfall
+        temp = claim.temperature
+        hist_len = len(historical_data)
         
-        if damage_type in weather_inconsistencies and weather_inconsistencies[damage_type]:
-            if damage_type == 'drought':
-                score += self.fraud_patterns['weather']['drought_with_rainfall']
-            elif damage_type == 'flood':
-                score += self.fraud_patterns['weather']['flood_without_rain']
-            elif damage_type == 'frost':
-                score += self.fraud_patterns['weather']['frost_high_temp']
+        # Timing: claims just before harvest, multiple recent claims
+        timing = 0.0
+        if crop in (0, 1) and days > 120:  # wheat, rice
+            timing += WEIGHTS[Rule.SUSPICIOUS_HARVEST]
+        if hist_len > 1:
+            timing += WEIGHTS[Rule.MULTIPLE_CLAIMS]
+        timing = timing if timing < 1.0 else 1.0
         
-        return min(score, 1.0)
-    
-    def analyze_satellite(self, claim_data):
-        """Analyze satellite imagery for artificial damage patterns"""
-        score = 0.0
+        # Geospatial: duplicate coordinates, area mismatch
+        geo = 0.0
+        if claim.has_duplicate_coords:
+            geo += WEIGHTS[Rule.DUPLICATE_COORDS]
+        if claim.area_mismatch > 0.3:
+            geo += WEIGHTS[Rule.AREA_MISMATCH]
+        geo = geo if geo < 1.0 else 1.0
         
-        # Mock satellite analysis
-        if claim_data.get('artificial_patterns', False):
-            score += self.fraud_patterns['satellite']['artificial_damage_pattern']
+        # Weather consistency with claimed damage
+        weather = 0.0
+        if dmg >= 0 and _WEATHER_MISMATCH[dmg](rain, temp):
+            weather += _WEATHER_RULE[dmg]
+        weather = weather if weather < 1.0 else 1.0
         
-        if claim_data.get('sudden_ndvi_drop', False):
-            score += self.fraud_patterns['satellite']['sudden_ndvi_drop']
-        
-        return min(score, 1.0)
-    
-    def analyze_behavior(self, farmer_data, historical_data):
-        """Analyze farmer behavioral patterns"""
-        score = 0.0
+        # Satellite: artificial damage patterns, sudden NDVI drop
+        satellite = 0.0
+        if claim.artificial_patterns:
+            satellite += WEIGHTS[Rule.ARTIFICIAL_DAMAGE]
+        if claim.sudden_ndvi_drop:
+            satellite += WEIGHTS[Rule.SUDDEN_NDVI_DROP]
+        satellite = satellite if satellite < 1.0 else 1.0
         
-        if len(historical_data) > 0:
-            claim_ratio = len([h for h in historical_data if h.get('claimed')]) / len(historical_data)
+        # Behavioral: claim frequency
+        behavioral = 0.0
+        if hist_len > 0:
+            claim_ratio = sum(1 for h in historical_data if h.get('claimed')) / hist_len
             if claim_ratio > 0.7:
-                score += self.fraud_patterns['behavioral']['high_claim_frequency']
+                behavioral += WEIGHTS[Rule.HIGH_CLAIM_FREQUENCY]
+        behavioral = behavioral if behavioral < 1.0 else 1.0
         
-        return min(score, 1.0)
+        flags = ((timing > 0.3) | (geo > 0.4) << 1 | (weather > 0.5) << 2 |
+                 (satellite > 0.5) << 3 | (behavioral > 0.4) << 4)
+        
+        fraud_score = 0.0
+        fraud_score += timing * 0.25
+        fraud_score += geo * 0.25
+        fraud_score += weather * 0.20
+        fraud_score += satellite * 0.20
+        fraud_score += behavioral * 0.10
+        return fraud_score, flags
+    
+    def _build_result(self, fraud_score, fraud_indicators):
+        """Assemble the detection result for a scored claim"""
+        fraud_score = float(fraud_score)  # Plain float, so the flags below are JSON-serializable bools
+        return {
+            'fraud_score': round(fraud_score, 2),
+            'risk_level': str(_RISK_LEVELS[np.searchsorted(_RISK_THRESHOLDS, fraud_score, side='right')]),
+            'fraud_indicators': fraud_indicators,
+            'requires_field_verification': fraud_score > 0.6,
+            'auto_reject': fraud_score > 0.85
+        }
 
 def run_fraud_detection_demo():
     """Run comprehensive fraud detection demonstration"""
-    print("🛡️ AI + Blockchain Crop Insurance Fraud Detection Demo")
-    print("=" * 65)
+    # Output is collected in memory and written to stdout in one call
+    out = io.StringIO()
+    print("🛡️ AI + Blockchain Crop Insurance Fraud Detection Demo", file=out)
+    print("=" * 65, file=out)
     
     detector = SimpleFraudDetector()
-    test_scenarios = []
     
-    # Scenario 1: Intentional Crop Damage
-    print("\n🔍 Test 1: Intentional Crop Damage Detection")
-    print("-" * 50)
-    
-    farmer_data = {
-        'farmer_id': '0x742d35Cc6C8A4935E225b6f8CB0bEf8',
-        'name': 'Kumar Singh',
-        'trust_score': 650
-    }
-    
-    claim_data = {
-        'crop_type': 'wheat',
-        'days_since_sowing': 125,  # Just before harvest
-        'damage_type': 'pest',
-        'claim_amount': 140000,
-        'artificial_patterns': True,  # AI detected artificial damage
-        'sudden_ndvi_drop': True,
-        'rainfall': 45,  # Adequate rainfall contradicts pest claim
-        'has_duplicate_coords': False,
-        'area_mismatch': 0.1
-    }
-    
-    historical_data = [
-        {'claimed': True, 'damage_type': 'pest'},
-        {'claimed': True, 'damage_type': 'pest'}
+    # (name, farmer, claim, history) for each scenario; all claims are scored in one batch
+    scenarios = [
+        (
+            'Intentional Crop Damage',
+            {
+                'farmer_id': '0x742d35Cc6C8A4935E225b6f8CB0bEf8',
+                'name': 'Kumar Singh',
+                'trust_score': 650
+            },
+            ClaimRecord(
+                crop_type='wheat',
+                days_since_sowing=125,  # Just before harvest
+                damage_type='pest',
+                claim_amount=140000,
+                artificial_patterns=True,  # AI detected artificial damage
+                sudden_ndvi_drop=True,
+                rainfall=45,  # Adequate rainfall contradicts pest claim
+                has_duplicate_coords=False,
+                area_mismatch=0.1
+            ),
+            [
+                {'claimed': True, 'damage_type': 'pest'},
+                {'claimed': True, 'damage_type': 'pest'}
+            ]
+        ),
+        (
+            'False Weather Claims',
+            {
+                'farmer_id': '0x8ba1f109551bD432803012645Hac189',
+                'name': 'Rajesh Patel',
+                'trust_score': 700
+            },
+            ClaimRecord(
+                crop_type='rice',
+                days_since_sowing=90,
+                damage_type='drought',
+                claim_amount=80000,
+                artificial_patterns=False,
+                sudden_ndvi_drop=False,
+                rainfall=45,  # Good rainfall contradicts drought claim
+                temperature=25,
+                has_duplicate_coords=False,
+                area_mismatch=0.0
+            ),
+            []
+        ),
+        (
+            'Duplicate Geo Claims',
+            {
+                'farmer_id': '0x9cd2e8c4c7f6b8a1d5e9f2a3b4c5d6e7',
+                'name': 'Suresh Kumar',
+                'trust_score': 600
+            },
+            ClaimRecord(
+                crop_type='cotton',
+                days_since_sowing=100,
+                damage_type='flood',
+                claim_amount=160000,
+                artificial_patterns=False,
+                sudden_ndvi_drop=False,
+                rainfall=120,  # Heavy rainfall supports flood claim
+                has_duplicate_coords=True,  # Same coordinates used before
+                area_mismatch=0.0
+            ),
+            []
+        ),
+        (
+            'Legitimate Claims',
+            {
+                'farmer_id': '0xabcdef1234567890abcdef1234567890',
+                'name': 'Honest Farmer',
+                'trust_score': 850
+            },
+            ClaimRecord(
+                crop_type='rice',
+                days_since_sowing=95,  # Normal timing
+                damage_type='flood',
+                claim_amount=60000,  # Reasonable amount
+                artificial_patterns=False,
+                sudden_ndvi_drop=False,
+                rainfall=150,  # Heavy rainfall supports flood claim
+                has_duplicate_coords=False,
+                area_mismatch=0.0
+            ),
+            [
+                {'claimed': False},
+                {'claimed': True, 'damage_type': 'flood'},
+                {'claimed': False}
+            ]
+        )
     ]
     
-    result = detector.detect_fraud(farmer_data, claim_data, historical_data)
+    claims_df = pd.DataFrame([
+        dict(asdict(claim), history_length=len(history), history_claim_ratio=_history_claim_ratio(history))
+        for _, _, claim, history in scenarios
+    ])
+    results = detector.detect_fraud_batch(claims_df)
+    indicators = decode_indicators(results['indicators_bitmask'].to_numpy())
+    test_scenarios = [(name, results.iloc[i]) for i, (name, _, _, _) in enumerate(scenarios)]
     
-    print(f"Farmer: {farmer_data['name']}")
-    print(f"Claim: ₹{claim_data['claim_amount']:,} for {claim_data['damage_type']} damage")
-    print(f"AI Detection: Artificial cutting patterns detected")
-    print(f"Fraud Score: {result['fraud_score']}/1.0")
-    print(f"Risk Level: {result['risk_level']}")
-    print(f"Fraud Indicators: {', '.join(result['fraud_indicators'])}")
-    print(f"Field Verification Required: {result['requires_field_verification']}")
+    # Scenario 1: Intentional Crop Damage
+    print("\n🔍 Test 1: Intentional Crop Damage Detection", file=out)
+    print("-" * 50, file=out)
+    
+    _, farmer_data, claim, _ = scenarios[0]
+    result = results.iloc[0]
     
-    test_scenarios.append(('Intentional Crop Damage', result))
+    print(f"Farmer: {farmer_data['name']}", file=out)
+    print(f"Claim: ₹{claim.claim_amount:,} for {claim.damage_type} damage", file=out)
+    print(f"AI Detection: Artificial cutting patterns detected", file=out)
+    print(f"Fraud Score: {result['fraud_score']}/1.0", file=out)
+    print(f"Risk Level: {result['risk_level']}", file=out)
+    print(f"Fraud Indicators: {', '.join(indicators[0])}", file=out)
+    print(f"Field Verification Required: {result['requires_field_verification']}", file=out)
     
     # Scenario 2: False Weather Claims
-    print("\n🌦️ Test 2: False Weather Claims Detection")
-    print("-" * 50)
-    
-    farmer_data = {
-        'farmer_id': '0x8ba1f109551bD432803012645Hac189',
-        'name': 'Rajesh Patel',
-        'trust_score': 700
-    }
-    
-    claim_data = {
-        'crop_type': 'rice',
-        'days_since_sowing': 90,
-        'damage_type': 'drought',
-        'claim_amount': 80000,
-        'artificial_patterns': False,
-        'sudden_ndvi_drop': False,
-        'rainfall': 45,  # Good rainfall contradicts drought claim
-        'temperature': 25,
-        'has_duplicate_coords': False,
-        'area_mismatch': 0.0
-    }
-    
-    historical_data = []
-    
-    result = detector.detect_fraud(farmer_data, claim_data, historical_data)
-    
-    print(f"Farmer: {farmer_data['name']}")
-    print(f"Claim: ₹{claim_data['claim_amount']:,} for {claim_data['damage_type']}")
-    print(f"Weather Issue: 45mm rainfall contradicts drought claim")
-    print(f"Fraud Score: {result['fraud_score']}/1.0")
-    print(f"Risk Level: {result['risk_level']}")
-    print(f"Fraud Indicators: {', '.join(result['fraud_indicators'])}")
-    
-    test_scenarios.append(('False Weather Claims', result))
+    print("\n🌦️ Test 2: False Weather Claims Detection", file=out)
+    print("-" * 50, file=out)
+    
+    _, farmer_data, claim, _ = scenarios[1]
+    result = results.iloc[1]
+    
+    print(f"Farmer: {farmer_data['name']}", file=out)
+    print(f"Claim: ₹{claim.claim_amount:,} for {claim.damage_type}", file=out)
+    print(f"Weather Issue: 45mm rainfall contradicts drought claim", file=out)
+    print(f"Fraud Score: {result['fraud_score']}/1.0", file=out)
+    print(f"Risk Level: {result['risk_level']}", file=out)
+    print(f"Fraud Indicators: {', '.join(indicators[1])}", file=out)
     
     # Scenario 3: Duplicate Geo-location Fraud
-    print("\n📍 Test 3: Duplicate Geo-location Claims")
-    print("-" * 50)
-    
-    farmer_data = {
-        'farmer_id': '0x9cd2e8c4c7f6b8a1d5e9f2a3b4c5d6e7',
-        'name': 'Suresh Kumar',
-        'trust_score': 600
-    }
-    
-    claim_data = {
-        'crop_type': 'cotton',
-        'days_since_sowing': 100,
-        'damage_type': 'flood',
-        'claim_amount': 160000,
-        'artificial_patterns': False,
-        'sudden_ndvi_drop': False,
-        'rainfall': 120,  # Heavy rainfall supports flood claim
-        'has_duplicate_coords': True,  # Same coordinates used before
-        'area_mismatch': 0.0
-    }
-    
-    historical_data = []
-    
-    result = detector.detect_fraud(farmer_data, claim_data, historical_data)
-    
-    print(f"Farmer: {farmer_data['name']}")
-    print(f"Issue: Same GPS coordinates used in previous claim")
-    print(f"Blockchain: Duplicate geo-hash detected")
-    print(f"Fraud Score: {result['fraud_score']}/1.0")
-    print(f"Risk Level: {result['risk_level']}")
-    print(f"Fraud Indicators: {', '.join(result['fraud_indicators'])}")
-    
-    test_scenarios.append(('Duplicate Geo Claims', result))
+    print("\n📍 Test 3: Duplicate Geo-location Claims", file=out)
+    print("-" * 50, file=out)
     
-    # Scenario 4: Legitimate Claim (Should Pass)
-    print("\n✅ Test 4: Legitimate Claim (Should Pass)")
-    print("-" * 50)
-    
-    farmer_data = {
-        'farmer_id': '0xabcdef1234567890abcdef1234567890',
-        'name': 'Honest Farmer',
-        'trust_score': 850
-    }
-    
-    claim_data = {
-        'crop_type': 'rice',
-        'days_since_sowing': 95,  # Normal timing
-        'damage_type': 'flood',
-        'claim_amount': 60000,  # Reasonable amount
-        'artificial_patterns': False,
-        'sudden_ndvi_drop': False,
-        'rainfall': 150,  # Heavy rainfall supports flood claim
-        'has_duplicate_coords': False,
-        'area_mismatch': 0.0
-    }
-    
-    historical_data = [
-        {'claimed': False},
-        {'claimed': True, 'damage_type': 'flood'},
-        {'claimed': False}
-    ]
+    _, farmer_data, claim, _ = scenarios[2]
+    result = results.iloc[2]
     
-    result = detector.detect_fraud(farmer_data, claim_data, historical_data)
+    print(f"Farmer: {farmer_data['name']}", file=out)
+    print(f"Issue: Same GPS coordinates used in previous claim", file=out)
+    print(f"Blockchain: Duplicate geo-hash detected", file=out)
+    print(f"Fraud Score: {result['fraud_score']}/1.0", file=out)
+    print(f"Risk Level: {result['risk_level']}", file=out)
+    print(f"Fraud Indicators: {', '.join(indicators[2])}", file=out)
+    
+    # Scenario 4: Legitimate Claim (Should Pass)
+    print("\n✅ Test 4: Legitimate Claim (Should Pass)", file=out)
+    print("-" * 50, file=out)
     
-    print(f"Farmer: {farmer_data['name']}")
-    print(f"Claim: ₹{claim_data['claim_amount']:,} for {claim_data['damage_type']}")
-    print(f"Weather: Heavy rainfall (consistent with flood claim)")
-    print(f"History: Normal claim pattern (33% claim rate)")
-    print(f"Fraud Score: {result['fraud_score']}/1.0")
-    print(f"Risk Level: {result['risk_level']}")
-    print(f"Should Pass: {'✅ YES' if result['fraud_score'] < 0.3 else '❌ NO'}")
+    _, farmer_data, claim, _ = scenarios[3]
+    result = results.iloc[3]
     
-    test_scenarios.append(('Legitimate Claims', result))
+    print(f"Farmer: {farmer_data['name']}", file=out)
+    print(f"Claim: ₹{claim.claim_amount:,} for {claim.damage_type}", file=out)
+    print(f"Weather: Heavy rainfall (consistent with flood claim)", file=out)
+    print(f"History: Normal claim pattern (33% claim rate)", file=out)
+    print(f"Fraud Score: {result['fraud_score']}/1.0", file=out)
+    print(f"Risk Level: {result['risk_level']}", file=out)
+    print(f"Should Pass: {'✅ YES' if result['fraud_score'] < 0.3 else '❌ NO'}", file=out)
     
     # Summary
-    print("\n" + "=" * 65)
-    print("🎯 FRAUD DETECTION DEMO RESULTS SUMMARY")
-    print("=" * 65)
+    print("\n" + "=" * 65, file=out)
+    print("🎯 FRAUD DETECTION DEMO RESULTS SUMMARY", file=out)
+    print("=" * 65, file=out)
     
     fraud_detected = 0
     legitimate_passed = 0
@@ -343,28 +514,30 @@ def run_fraud_detection_demo():
             if result['fraud_score'] > 0.5:
                 fraud_detected += 1
         
-        print(f"{i}. {test_name}: {status}")
-        print(f"   Fraud Score: {result['fraud_score']}/1.0, Risk: {result['risk_level']}")
-    
-    print(f"\nFraud Detection Rate: {fraud_detected}/3 ({fraud_detected/3*100:.1f}%)")
-    print(f"False Positive Rate: {1-legitimate_passed}/1 ({(1-legitimate_passed)*100:.1f}%)")
-    
-    print("\n🛡️ KEY FRAUD PREVENTION FEATURES:")
-    print("• AI Computer Vision: Detects artificial crop cutting patterns")
-    print("• Weather Cross-Verification: Validates claims against meteorological data")
-    print("• Blockchain Geo-Hashing: Prevents duplicate field insurance")
-    print("• Behavioral Analysis: Identifies suspicious claim patterns")
-    print("• Satellite NDVI Monitoring: Tracks crop health changes")
-    print("• Trust Scoring: Dynamic risk assessment based on history")
-    
-    print("\n🌾 IMPACT SUMMARY:")
-    print(f"• Expected Fraud Reduction: 85-90%")
-    print(f"• Processing Time: 72 hours → 4 hours")
-    print(f"• Investigation Accuracy: 96%+")
-    print(f"• Cost Savings: 60-80% reduction in fraudulent payouts")
-    
-    print("\n✨ The AI + Blockchain system successfully prevents farmer fraud")
-    print("   while ensuring legitimate farmers get fair and fast service!")
+        print(f"{i}. {test_name}: {status}", file=out)
+        print(f"   Fraud Score: {result['fraud_score']}/1.0, Risk: {result['risk_level']}", file=out)
+    
+    print(f"\nFraud Detection Rate: {fraud_detected}/3 ({fraud_detected/3*100:.1f}%)", file=out)
+    print(f"False Positive Rate: {1-legitimate_passed}/1 ({(1-legitimate_passed)*100:.1f}%)", file=out)
+    
+    print("\n🛡️ KEY FRAUD PREVENTION FEATURES:", file=out)
+    print("• AI Computer Vision: Detects artificial crop cutting patterns", file=out)
+    print("• Weather Cross-Verification: Validates claims against meteorological data", file=out)
+    print("• Blockchain Geo-Hashing: Prevents duplicate field insurance", file=out)
+    print("• Behavioral Analysis: Identifies suspicious claim patterns", file=out)
+    print("• Satellite NDVI Monitoring: Tracks crop health changes", file=out)
+    print("• Trust Scoring: Dynamic risk assessment based on history", file=out)
+    
+    print("\n🌾 IMPACT SUMMARY:", file=out)
+    print(f"• Expected Fraud Reduction: 85-90%", file=out)
+    print(f"• Processing Time: 72 hours → 4 hours", file=out)
+    print(f"• Investigation Accuracy: 96%+", file=out)
+    print(f"• Cost Savings: 60-80% reduction in fraudulent payouts", file=out)
+    
+    print("\n✨ The AI + Blockchain system successfully prevents farmer fraud", file=out)
+    print("   while ensuring legitimate farmers get fair and fast service!", file=out)
+    
+    sys.stdout.write(out.getvalue())
 
 if __name__ == "__main__":
     run_fraud_detection_demo()
\ No newline at end of file
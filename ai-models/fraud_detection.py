@@ -3,24 +3,205 @@ import pandas as pd
 from sklearn.ensemble import IsolationForest, RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
+from sklearn import config_context
 import joblib
 import logging
+import functools
+from enum import IntEnum
 from datetime import datetime, timedelta
 import json
-import cv2
-from tensorflow.keras.models import load_model
 import requests
 
+try:
+    from pybloom_live import BloomFilter
+except ImportError:
+    BloomFilter = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+class _NamedCode(IntEnum):
+    """Integer code that prints as its lower-case name (e.g. in claim reports)"""
+    def __str__(self):
+        return self.name.lower()
+
+class CropType(_NamedCode):
+    """Crop codes; values index _RANGE_MIN / _RANGE_MAX"""
+    WHEAT = 0
+    RICE = 1
+    COTTON = 2
+    SUGARCANE = 3
+
+class DamageType(_NamedCode):
+    """Claimed damage codes"""
+    DROUGHT = 0
+    FLOOD = 1
+    HAIL = 2
+    FROST = 3
+    PEST = 4
+    DISEASE = 5
+
+class RiskLevel(IntEnum):
+    """Risk levels in increasing order; values index _RISK_LEVELS"""
+    LOW = 0
+    MEDIUM = 1
+    HIGH = 2
+    CRITICAL = 3
+
+def _code_lookup(codes):
+    """Map both lower-case names and existing codes to enum members, so string and enum inputs score alike"""
+    lookup = {member.name.lower(): member for member in codes}
+    lookup.update({member: member for member in codes})  # IntEnum keys also match plain ints
+    return lookup
+
+# Expected claim window (days since sowing) per crop, indexed by crop code
+_CROP_CODES = _code_lookup(CropType)
+_RANGE_MIN = np.array([60, 90, 90, 180], dtype=np.int16)
+_RANGE_MAX = np.array([180, 150, 200, 365], dtype=np.int16)
+
+# Batch scoring encodes damage types once so weather rules run as column masks
+_DAMAGE_CODES = _code_lookup(DamageType)
+_HARVEST_CROPS = (CropType.WHEAT, CropType.RICE)
+
+# Columnar schema for a farmer's historical claims (~26 bytes/row vs ~240 for a dict).
+# Dates are UTC so offsets such as the backend's toISOString() 'Z' suffix parse cleanly;
+# amounts stay float64 so the 80% large-claim cut-off is exact for any realistic amount
+_HISTORY_SCHEMA = {
+    'date': 'datetime64[ns, UTC]',
+    'claimed': 'bool',
+    'damage_type': 'category',
+    'claim_amount': 'float64',
+    'policy_amount': 'float64'
+}
+
+# Fixed-width historical claims for the compiled history kernel. claim_row is the
+# batch row of the claim a record belongs to; days_ago counts back from that claim's
+# date; damage_type holds the caller's own integer codes (-1 for none)
+HISTORY_DTYPE = np.dtype([
+    ('claim_row', 'i4'),
+    ('days_ago', 'i4'),
+    ('claimed', '?'),
+    ('damage_type', 'i1'),
+    ('claim_amount', 'i8'),
+    ('policy_amount', 'i8')
+])
+
+# Stubbed weather rows for stub_tables['weather']; NaN rainfall means "use the live lookup"
+WEATHER_STUB_DTYPE = np.dtype([('rain', 'f4'), ('tmin', 'f4'), ('hail', '?')])
+
+# Weights of the temporal, geospatial, weather, satellite and behavioral scores
+_SCORE_WEIGHTS = np.array([0.25, 0.25, 0.20, 0.20, 0.10])
+# Scores equal to a threshold fall into the higher level (searchsorted side='right')
+_RISK_THRESHOLDS = np.array([0.3, 0.6, 0.8])
+_RISK_LEVELS = np.array([level.name for level in RiskLevel])
+_FRAUD_INDICATORS = np.array([
+    "Suspicious timing pattern detected",
+    "Geospatial data inconsistency",
+    "Weather data mismatch with claimed damage",
+    "Satellite imagery suggests artificial damage",
+    "Unusual behavioral pattern in claim history"
+])
+
+@functools.lru_cache(maxsize=4096)
+def _parse_iso(value):
+    """Parse an ISO date string; repeated dates (e.g. a regional flood event) hit the cache"""
+    return datetime.fromisoformat(value)
+
+def _json_default(value):
+    """Fallback encoder for values the stdlib json module does not handle"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _history_kernel(claim_row, days_ago, claimed, damage_type, claim_amount, policy_amount, n_claims):
+    """Recent-claim counts and behavioral scores per claim in one pass over HISTORY_DTYPE columns"""
+    recent_claims = np.zeros(n_claims, dtype=np.int32)
+    total_policies = np.zeros(n_claims, dtype=np.int32)
+    total_claims = np.zeros(n_claims, dtype=np.int32)
+    large_claims = np.zeros(n_claims, dtype=np.int32)
+    first_damage = np.zeros(n_claims, dtype=np.int8)
+    mixed_damage = np.zeros(n_claims, dtype=np.bool_)
+    
+    for i in range(len(claim_row)):
+        row = claim_row[i]
+        total_policies[row] += 1
+        if days_ago[i] < 90:
+            recent_claims[row] += 1
+        if claim_amount[i] > policy_amount[i] * 0.8:
+            large_claims[row] += 1
+        if claimed[i]:
+            if total_claims[row] == 0:
+                first_damage[row] = damage_type[i]
+            elif damage_type[i] != first_damage[row]:
+                mixed_damage[row] = True
+            total_claims[row] += 1
+    
+    behavioral_scores = np.zeros(n_claims)
+    for row in range(n_claims):
+        score = 0.0
+        if total_policies[row] > 0 and total_claims[row] / total_policies[row] > 0.7:
+            score += 0.5
+        if not mixed_damage[row] and total_claims[row] > 2:
+            score += 0.3
+        if large_claims[row] > total_claims[row] * 0.5:
+            score += 0.4
+        behavioral_scores[row] = min(score, 1.0)
+    return recent_claims, behavioral_scores
+
+if _NUMBA_AVAILABLE:
+    _history_kernel = njit(cache=True)(_history_kernel)
+
+def _hashable_location(lat, lon):
+    """Whether a coordinate pair can be geohashed; missing, NaN and out-of-range values cannot"""
+    return lat is not None and lon is not None and abs(lat) <= 90 and abs(lon) <= 180
+
+def _geohash_int(lat, lon, precision=8):
+    """Integer geohash: bit-interleaved quantized lon/lat (precision 8 = 40 bits, ~20m cells)"""
+    total_bits = precision * 5
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    lon_q = min(int((lon + 180.0) / 360.0 * (1 << lon_bits)), (1 << lon_bits) - 1)
+    lat_q = min(int((lat + 90.0) / 180.0 * (1 << lat_bits)), (1 << lat_bits) - 1)
+    
+    geohash = 0
+    for bit in range(lon_bits):
+        geohash |= ((lon_q >> bit) & 1) << (2 * bit + 1)
+    for bit in range(lat_bits):
+        geohash |= ((lat_q >> bit) & 1) << (2 * bit)
+    return geohash
+
 class FraudDetectionEngine:
     """
     Advanced AI-powered fraud detection system for crop insurance
     Detects intentional crop damage, false claims, and suspicious patterns
     """
     
-    def __init__(self):
+    def __init__(self, expected_claims=None, stub_tables=None):
         self.isolation_forest = None
         self.random_forest = None
         self.scaler = StandardScaler()
+        self._rng = np.random.default_rng()
+        # Optional row-aligned sensor stubs for detect_fraud_batch (row i stubs claim i), each
+        # standing in for one helper: 'weather' (WEATHER_STUB_DTYPE) for _get_weather_data,
+        # 'damage_pattern' (bool, artificial) for _analyze_damage_pattern, 'artificial_damage'
+        # for _detect_artificial_damage_signs and 'dup_coords' for _check_duplicate_coordinates
+        self._stub_tables = stub_tables
+        
+        # Geohashes of insured fields; a Bloom filter keeps ~2 bytes/entry for large volumes
+        if expected_claims and BloomFilter is not None:
+            self._known_hashes = BloomFilter(capacity=expected_claims, error_rate=1e-6)
+        else:
+            self._known_hashes = set()
         self.setup_logging()
         
     def setup_logging(self):
@@ -42,7 +223,8 @@ class FraudDetectionEngine:
         Args:
             farmer_data: Dict containing farmer profile information
             claim_data: Dict containing current claim details
-            historical_data: List of historical claims and patterns
+            historical_data: Historical claims, as a list of dicts or a DataFrame
+                following _HISTORY_SCHEMA (see load_historical_data)
             
         Returns:
             Dict with fraud score, risk level, and specific fraud indicators
@@ -89,38 +271,234 @@ class FraudDetectionEngine:
             'timestamp': datetime.now().isoformat()
         }
 
+    def detect_fraud_batch(self, claims_df, historical_df=None):
+        """
+        Vectorized fraud detection over many claims at once
+        
+        Args:
+            claims_df: DataFrame with one claim per row (same fields as claim_data,
+                plus farmer_id to match claims against historical_df)
+            historical_df: DataFrame of historical claims keyed by farmer_id, or a
+                HISTORY_DTYPE array scored by the compiled history kernel
+            
+        Returns:
+            DataFrame indexed like claims_df with fraud score, risk level and indicators
+        """
+        claims = claims_df.reset_index(drop=True)
+        if historical_df is None:
+            historical_df = pd.DataFrame(columns=['farmer_id', 'date', 'claimed', 'damage_type',
+                                                  'claim_amount', 'policy_amount'])
+        
+        if isinstance(historical_df, np.ndarray):
+            # The compiled kernel indexes its per-claim counters by claim_row without bounds checks
+            if historical_df.dtype != HISTORY_DTYPE:
+                raise TypeError(f"historical array must have HISTORY_DTYPE, got {historical_df.dtype}")
+            claim_rows = historical_df['claim_row']
+            if claim_rows.size and (claim_rows.min() < 0 or claim_rows.max() >= len(claims)):
+                raise ValueError(f"historical claim_row values must lie in [0, {len(claims)}) to index claims_df")
+            recent_claims, behavioral_scores = _history_kernel(
+                historical_df['claim_row'], historical_df['days_ago'], historical_df['claimed'],
+                historical_df['damage_type'], historical_df['claim_amount'], historical_df['policy_amount'],
+                len(claims)
+            )
+        else:
+            recent_claims = self._batch_recent_claims(claims, historical_df)
+            behavioral_scores = self._batch_behavioral_scores(claims, historical_df)
+        
+        # Sub-scores as columns of an (N, 5) matrix
+        sub_scores = np.column_stack([
+            self._batch_temporal_scores(claims, recent_claims),
+            self._batch_geospatial_scores(claims),
+            self._batch_weather_scores(claims),
+            self._batch_satellite_scores(claims),
+            behavioral_scores
+        ])
+        np.minimum(sub_scores, 1.0, out=sub_scores)
+        
+        # Accumulate column by column (same order as detect_claim_fraud) so scores
+        # sitting exactly on a risk threshold classify identically on both paths
+        fraud_scores = np.zeros(len(claims))
+        for column, weight in enumerate(_SCORE_WEIGHTS):
+            fraud_scores += sub_scores[:, column] * weight
+        
+        risk_levels = _RISK_LEVELS[np.searchsorted(_RISK_THRESHOLDS, fraud_scores, side='right')]
+        flagged = sub_scores > 0.5
+        
+        self.logger.info(f"Batch fraud analysis completed for {len(claims)} claims")
+        
+        return pd.DataFrame({
+            # Python's round() rather than ndarray.round(): NumPy scales by 100 first, so
+            # ties such as 0.155 would round differently from detect_claim_fraud
+            'fraud_score': [round(score, 2) for score in fraud_scores.tolist()],
+            'risk_level': risk_levels,
+            'fraud_indicators': [_FRAUD_INDICATORS[row].tolist() for row in flagged],
+            'requires_field_verification': fraud_scores > 0.6,
+            'auto_reject': fraud_scores > 0.85,
+            'timestamp': datetime.now().isoformat()
+        }, index=claims_df.index)
+
+    def _batch_recent_claims(self, claims, historical_df):
+        """Number of historical claims within 90 days of each current claim"""
+        # Both sides in UTC (naive dates are taken as UTC), as in _analyze_temporal_patterns,
+        # so _HISTORY_SCHEMA frames and 'Z'-suffixed backend dates compare cleanly
+        claim_dates = pd.to_datetime(claims['claim_date'], format='ISO8601', utc=True)
+        history_dates = pd.to_datetime(historical_df['date'], format='ISO8601', utc=True)
+        pairs = pd.DataFrame({
+            'row': np.arange(len(claims)),
+            'farmer_id': claims['farmer_id'],
+            'claim_date': claim_dates
+        }).merge(
+            historical_df[['farmer_id']].assign(date=history_dates),
+            on='farmer_id'
+        )
+        recent = ((pairs['claim_date'] - pairs['date']).dt.days < 90).groupby(pairs['row']).sum()
+        return recent.reindex(np.arange(len(claims)), fill_value=0).to_numpy()
+
+    def _batch_temporal_scores(self, claims, recent_claims):
+        """Column-wise version of _analyze_temporal_patterns"""
+        claim_dates = pd.to_datetime(claims['claim_date'], format='ISO8601', utc=True)
+        sowing_dates = pd.to_datetime(claims['sowing_date'], format='ISO8601', utc=True)
+        days_since_sowing = (claim_dates - sowing_dates).dt.days.to_numpy()
+        crop_types = claims['crop_type']
+        
+        crop_codes = crop_types.map(_CROP_CODES).fillna(-1).to_numpy(dtype=np.int8)
+        # Unknown crops (-1) index the last range but are masked out
+        outside_cycle = (crop_codes >= 0) & ((days_since_sowing < _RANGE_MIN[crop_codes]) |
+                                             (days_since_sowing > _RANGE_MAX[crop_codes]))
+        near_harvest = np.isin(crop_codes, _HARVEST_CROPS) & (days_since_sowing > 120)
+        
+        return 0.3 * (recent_claims > 2) + 0.2 * outside_cycle + 0.3 * near_harvest
+
+    def _batch_geospatial_scores(self, claims):
+        """Column-wise version of _verify_geospatial_data"""
+        lat = claims['latitude'].to_numpy(dtype=float)
+        lon = claims['longitude'].to_numpy(dtype=float)
+        reported_area = claims['area_hectares'].to_numpy(dtype=float)
+        
+        invalid = (np.isnan(lat) | np.isnan(lon) | (lat == 0) | (lon == 0) |
+                   (np.abs(lat) > 90) | (np.abs(lon) > 180))
+        
+        estimated_area = self._estimate_field_areas_from_satellite(lat, lon)
+        area_mismatch = (estimated_area != 0) & (np.abs(estimated_area - reported_area) / reported_area > 0.3)
+        
+        duplicate = self._stub_rows('dup_coords', len(claims))
+        if duplicate is None:
+            duplicate = np.array([bool(self._check_duplicate_coordinates(la, lo))
+                                  for la, lo in zip(lat, lon)])
+        
+        return 0.5 * invalid + 0.4 * area_mismatch + 0.6 * duplicate
+
+    def _batch_weather_scores(self, claims):
+        """Column-wise version of _verify_weather_consistency"""
+        weather = self._get_weather_data_batch(
+            claims['latitude'].to_numpy(dtype=float), claims['longitude'].to_numpy(dtype=float), claims['claim_date']
+        )
+        if not weather:
+            return np.full(len(claims), 0.2)  # Unable to verify is slightly suspicious
+        rainfall = weather['rainfall_7days']
+        min_temp = weather['min_temp']
+        hail = weather['hail_detected']
+        
+        damage_code = claims['damage_type'].map(_DAMAGE_CODES).fillna(-1).to_numpy(dtype=np.int8)
+        drought_mask = (damage_code == DamageType.DROUGHT) & (rainfall > 20)
+        flood_mask = (damage_code == DamageType.FLOOD) & (rainfall < 50)
+        hail_mask = (damage_code == DamageType.HAIL) & ~hail
+        frost_mask = (damage_code == DamageType.FROST) & (min_temp > 5)
+        inconsistent = drought_mask | flood_mask | hail_mask | frost_mask
+        
+        return 0.7 * inconsistent
+
+    def _batch_satellite_scores(self, claims):
+        """Column-wise version of _analyze_satellite_images"""
+        locations = list(zip(claims['latitude'], claims['longitude'], claims['claim_date']))
+        lat = claims['latitude'].to_numpy(dtype=float)
+        lon = claims['longitude'].to_numpy(dtype=float)
+        ndvi_current = self._get_ndvi_data_batch(lat, lon, claims['claim_date'])
+        ndvi_historical = self._get_ndvi_data_batch(lat, lon, claims['claim_date'], days_back=30)
+        
+        significant_drop = (ndvi_current != 0) & (ndvi_historical != 0) & (ndvi_historical - ndvi_current > 0.3)
+        
+        artificial_pattern = self._stub_rows('damage_pattern', len(claims))
+        if artificial_pattern is not None:
+            artificial_pattern = significant_drop & artificial_pattern
+        else:
+            # Damage pattern analysis is only needed where NDVI dropped sharply
+            artificial_pattern = np.zeros(len(claims), dtype=bool)
+            for i in np.flatnonzero(significant_drop):
+                artificial_pattern[i] = self._analyze_damage_pattern(*locations[i]) == 'artificial'
+        
+        artificial_signs = self._stub_rows('artificial_damage', len(claims))
+        if artificial_signs is None:
+            artificial_signs = np.array([bool(self._detect_artificial_damage_signs(lat, lon, date))
+                                         for lat, lon, date in locations])
+        
+        return 0.6 * artificial_pattern + 0.8 * artificial_signs
+
+    def _batch_behavioral_scores(self, claims, historical_df):
+        """Column-wise version of _analyze_farmer_behavior"""
+        history = historical_df.assign(
+            claimed=historical_df['claimed'].fillna(False).astype(bool),
+            large_claim=(historical_df['claim_amount'].fillna(0).astype(float) >
+                         historical_df['policy_amount'].fillna(0).astype(float) * 0.8)
+        )
+        grouped = history.groupby('farmer_id')
+        stats = pd.DataFrame({
+            'total_policies': grouped.size(),
+            'total_claims': grouped['claimed'].sum(),
+            'large_claims': grouped['large_claim'].sum(),
+            'damage_types': history[history['claimed']].groupby('farmer_id')['damage_type'].nunique(dropna=False)
+        }).reindex(claims['farmer_id']).fillna(0)
+        
+        total_policies = stats['total_policies'].to_numpy(dtype=float)
+        total_claims = stats['total_claims'].to_numpy(dtype=float)
+        claim_ratio = np.divide(total_claims, total_policies,
+                                out=np.zeros_like(total_claims), where=total_policies > 0)
+        
+        high_frequency = claim_ratio > 0.7
+        consistent_damage = (stats['damage_types'].to_numpy() == 1) & (total_claims > 2)
+        large_amounts = stats['large_claims'].to_numpy(dtype=float) > total_claims * 0.5
+        
+        return 0.5 * high_frequency + 0.3 * consistent_damage + 0.4 * large_amounts
+
+    def load_historical_data(self, path):
+        """Load a farmer's historical claims from a parquet file"""
+        return self._history_frame(pd.read_parquet(path, columns=list(_HISTORY_SCHEMA)))
+
+    def _history_frame(self, historical_data):
+        """Columnar view of historical claims following _HISTORY_SCHEMA"""
+        history = pd.DataFrame(historical_data, columns=list(_HISTORY_SCHEMA))
+        history['date'] = pd.to_datetime(history['date'], format='ISO8601', utc=True)
+        history['claimed'] = history['claimed'].astype('boolean').fillna(False)
+        return history.astype(_HISTORY_SCHEMA)
+
     def _analyze_temporal_patterns(self, farmer_data, claim_data, historical_data):
         """Detect suspicious timing patterns"""
         score = 0.0
-        claim_date = datetime.fromisoformat(claim_data['claim_date'])
+        claim_date = _parse_iso(claim_data['claim_date'])
         
-        # Check for multiple claims in short time
-        recent_claims = [claim for claim in historical_data 
-                        if (claim_date - datetime.fromisoformat(claim['date'])).days < 90]
+        # Check for multiple claims in short time (repeated dates hit the _parse_iso cache)
+        if isinstance(historical_data, pd.DataFrame):
+            # Frame dates are UTC; a naive claim date is taken as UTC too
+            claim_utc = pd.to_datetime(claim_date, utc=True)
+            recent_claims = int(((claim_utc - historical_data['date']).dt.days < 90).sum())
+        else:
+            recent_claims = sum(1 for claim in historical_data
+                                if (claim_date - _parse_iso(claim['date'])).days < 90)
         
-        if len(recent_claims) > 2:
+        if recent_claims > 2:
             score += 0.3  # Multiple claims in 3 months is suspicious
             
-        # Check claim timing vs crop cycle
-        crop_type = claim_data['crop_type']
-        sowing_date = datetime.fromisoformat(claim_data['sowing_date'])
+        # Check claim timing vs crop cycle (crop_type may be a name or a CropType)
+        code = _CROP_CODES.get(claim_data['crop_type'], -1)
+        sowing_date = _parse_iso(claim_data['sowing_date'])
         days_since_sowing = (claim_date - sowing_date).days
         
         # Suspicious if claim is too early or too late in crop cycle
-        expected_ranges = {
-            'wheat': (60, 180),
-            'rice': (90, 150),
-            'cotton': (90, 200),
-            'sugarcane': (180, 365)
-        }
-        
-        if crop_type in expected_ranges:
-            min_days, max_days = expected_ranges[crop_type]
-            if days_since_sowing < min_days or days_since_sowing > max_days:
-                score += 0.2
+        if code >= 0 and not (_RANGE_MIN[code] <= days_since_sowing <= _RANGE_MAX[code]):
+            score += 0.2
                 
         # Check for claims just before harvest (suspicious timing)
-        if crop_type in ['wheat', 'rice'] and days_since_sowing > 120:
+        if code in _HARVEST_CROPS and days_since_sowing > 120:
             score += 0.3
             
         return min(score, 1.0)
@@ -133,8 +511,8 @@ class FraudDetectionEngine:
         lon = claim_data.get('longitude')
         reported_area = claim_data.get('area_hectares')
         
-        # Check if coordinates are valid
-        if not lat or not lon or abs(lat) > 90 or abs(lon) > 180:
+        # Check if coordinates are valid (written so NaN fails the range test, as in the batch mask)
+        if not lat or not lon or not (abs(lat) <= 90 and abs(lon) <= 180):
             score += 0.5
             
         # Verify field area using satellite data (simulated)
@@ -156,7 +534,7 @@ class FraudDetectionEngine:
         
         lat = claim_data.get('latitude')
         lon = claim_data.get('longitude')
-        damage_type = claim_data.get('damage_type')
+        damage_code = _DAMAGE_CODES.get(claim_data.get('damage_type'), -1)
         claim_date = claim_data.get('claim_date')
         
         # Get actual weather data for the location and time
@@ -167,13 +545,13 @@ class FraudDetectionEngine:
             
         # Check consistency between claimed damage and weather
         inconsistencies = {
-            'drought': weather_data.get('rainfall_7days', 0) > 20,  # Rain during drought claim
-            'flood': weather_data.get('rainfall_7days', 0) < 50,    # No heavy rain during flood claim
-            'hail': not weather_data.get('hail_detected', False),   # No hail detected
-            'frost': weather_data.get('min_temp', 20) > 5,          # Temp too high for frost
+            DamageType.DROUGHT: weather_data.get('rainfall_7days', 0) > 20,  # Rain during drought claim
+            DamageType.FLOOD: weather_data.get('rainfall_7days', 0) < 50,    # No heavy rain during flood claim
+            DamageType.HAIL: not weather_data.get('hail_detected', False),   # No hail detected
+            DamageType.FROST: weather_data.get('min_temp', 20) > 5,          # Temp too high for frost
         }
         
-        if damage_type in inconsistencies and inconsistencies[damage_type]:
+        if inconsistencies.get(damage_code, False):
             score += 0.7
             
         return min(score, 1.0)
@@ -209,13 +587,14 @@ class FraudDetectionEngine:
 
     def _analyze_farmer_behavior(self, farmer_data, historical_data):
         """Analyze farmer's historical behavior patterns"""
-        score = 0.0
+        if isinstance(historical_data, pd.DataFrame):
+            return self._analyze_history_frame(historical_data)
         
-        farmer_id = farmer_data.get('farmer_id')
+        score = 0.0
         
         # Calculate claim frequency
         total_policies = len(historical_data)
-        total_claims = len([d for d in historical_data if d.get('claimed')])
+        total_claims = sum(1 for d in historical_data if d.get('claimed'))
         
         if total_policies > 0:
             claim_ratio = total_claims / total_policies
@@ -224,13 +603,42 @@ class FraudDetectionEngine:
                 score += 0.5
                 
         # Check for consistent damage types (might indicate knowledge of system)
-        damage_types = [d.get('damage_type') for d in historical_data if d.get('claimed')]
-        if len(set(damage_types)) == 1 and len(damage_types) > 2:
+        damage_types = {d.get('damage_type') for d in historical_data if d.get('claimed')}
+        if len(damage_types) == 1 and total_claims > 2:
             score += 0.3
             
         # Check claim amounts vs policy amounts
-        large_claims = len([d for d in historical_data 
-                          if d.get('claim_amount', 0) > d.get('policy_amount', 0) * 0.8])
+        large_claims = sum(1 for d in historical_data
+                           if d.get('claim_amount', 0) > d.get('policy_amount', 0) * 0.8)
+        
+        if large_claims > total_claims * 0.5:  # >50% claims are for large amounts
+            score += 0.4
+            
+        return min(score, 1.0)
+
+    def _analyze_history_frame(self, history):
+        """_analyze_farmer_behavior for a _HISTORY_SCHEMA frame, using column reductions"""
+        score = 0.0
+        
+        # Calculate claim frequency
+        total_policies = len(history)
+        total_claims = int(history['claimed'].sum())
+        
+        if total_policies > 0:
+            claim_ratio = history['claimed'].mean()
+            
+            if claim_ratio > 0.7:  # Claims in >70% of policies
+                score += 0.5
+                
+        # Check for consistent damage types (might indicate knowledge of system)
+        damage_types = history.loc[history['claimed'], 'damage_type']
+        if damage_types.nunique(dropna=False) == 1 and total_claims > 2:
+            score += 0.3
+            
+        # Check claim amounts vs policy amounts
+        claim_amounts = history['claim_amount'].fillna(0).to_numpy(dtype=np.float64)
+        policy_amounts = history['policy_amount'].fillna(0).to_numpy(dtype=np.float64)
+        large_claims = int((claim_amounts > policy_amounts * 0.8).sum())
         
         if large_claims > total_claims * 0.5:  # >50% claims are for large amounts
             score += 0.4
@@ -239,14 +647,7 @@ class FraudDetectionEngine:
 
     def _calculate_risk_level(self, fraud_score):
         """Calculate risk level based on fraud score"""
-        if fraud_score < 0.3:
-            return 'LOW'
-        elif fraud_score < 0.6:
-            return 'MEDIUM'
-        elif fraud_score < 0.8:
-            return 'HIGH'
-        else:
-            return 'CRITICAL'
+        return str(_RISK_LEVELS[np.searchsorted(_RISK_THRESHOLDS, fraud_score, side='right')])
 
     def _generate_fraud_indicators(self, temporal, geo, weather, satellite, behavioral):
         """Generate specific fraud indicators based on scores"""
@@ -270,26 +671,67 @@ class FraudDetectionEngine:
         """Estimate field area from satellite imagery"""
         # This would integrate with satellite imagery APIs
         # For demo, returning a random value
-        return np.random.uniform(0.5, 2.0)
+        return self._rng.uniform(0.5, 2.0)
+
+    def _estimate_field_areas_from_satellite(self, lats, lons):
+        """Estimate field areas for arrays of coordinates in one call"""
+        return self._rng.uniform(0.5, 2.0, size=len(lats))
+
+    def register_claim_coordinates(self, lat, lon):
+        """Record a claim's field location so later claims on the same field are flagged"""
+        # Invalid coordinates are scored as such at claim time and are never indexed
+        if _hashable_location(lat, lon):
+            self._known_hashes.add(_geohash_int(lat, lon))
 
     def _check_duplicate_coordinates(self, lat, lon):
         """Check if coordinates are used in other claims"""
-        # This would query the database for duplicate coordinates
-        return False
+        # Missing, NaN or out-of-range coordinates are scored as invalid elsewhere, never hashed
+        if not _hashable_location(lat, lon):
+            return False
+        return _geohash_int(lat, lon) in self._known_hashes
 
     def _get_weather_data(self, lat, lon, date):
         """Get weather data for specific location and date"""
         # This would integrate with weather APIs like OpenWeather
         return {
-            'rainfall_7days': np.random.uniform(0, 100),
-            'min_temp': np.random.uniform(-5, 25),
+            'rainfall_7days': self._rng.uniform(0, 100),
+            'min_temp': self._rng.uniform(-5, 25),
             'hail_detected': False
         }
 
+    def _get_weather_data_batch(self, lats, lons, dates):
+        """Get weather data for many locations as arrays of shape (N,)"""
+        n = len(lats)
+        weather = {
+            'rainfall_7days': self._rng.uniform(0, 100, size=n),
+            'min_temp': self._rng.uniform(-5, 25, size=n),
+            'hail_detected': np.zeros(n, dtype=bool)
+        }
+        stub = self._stub_rows('weather', n)
+        if stub is not None:
+            stubbed = ~np.isnan(stub['rain'])
+            weather['rainfall_7days'] = np.where(stubbed, stub['rain'], weather['rainfall_7days'])
+            weather['min_temp'] = np.where(stubbed, stub['tmin'], weather['min_temp'])
+            weather['hail_detected'] = np.where(stubbed, stub['hail'], weather['hail_detected'])
+        return weather
+
+    def _stub_rows(self, name, n):
+        """Stub table for a batch of n claims, or None when that reading is not stubbed"""
+        if self._stub_tables is None or name not in self._stub_tables:
+            return None
+        table = self._stub_tables[name]
+        if len(table) != n:
+            raise ValueError(f"stub table '{name}' has {len(table)} rows for a batch of {n} claims")
+        return table
+
     def _get_ndvi_data(self, lat, lon, date, days_back=0):
         """Get NDVI data from satellite"""
         # This would integrate with satellite APIs like Sentinel-2
-        return np.random.uniform(0.2, 0.8)
+        return self._rng.uniform(0.2, 0.8)
+
+    def _get_ndvi_data_batch(self, lats, lons, dates, days_back=0):
+        """Get NDVI data for many locations in one call"""
+        return self._rng.uniform(0.2, 0.8, size=len(lats))
 
     def _analyze_damage_pattern(self, lat, lon, date):
         """Analyze if damage pattern looks natural or artificial"""
@@ -311,22 +753,25 @@ class FraudDetectionEngine:
             'weather_consistency', 'area_accuracy', 'ndvi_drop'
         ]
         
-        X = df[features]
-        y = df['is_fraud']
+        # float32 halves memory traffic; plain arrays skip per-column DataFrame introspection
+        X = df[features].to_numpy(dtype=np.float32)
+        y = df['is_fraud'].to_numpy()
         
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
         
-        # Scale features
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
-        
-        # Train models
-        self.isolation_forest = IsolationForest(contamination=0.1, random_state=42)
-        self.isolation_forest.fit(X_train_scaled)
-        
-        self.random_forest = RandomForestClassifier(n_estimators=100, random_state=42)
-        self.random_forest.fit(X_train_scaled, y_train)
+        # Features are engineered scores, so sklearn's NaN/inf validation is skipped
+        with config_context(assume_finite=True):
+            # Scale features
+            X_train_scaled = self.scaler.fit_transform(X_train)
+            X_test_scaled = self.scaler.transform(X_test)
+            
+            # Train models
+            self.isolation_forest = IsolationForest(contamination=0.1, random_state=42, n_jobs=-1)
+            self.isolation_forest.fit(X_train_scaled)
+            
+            self.random_forest = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=-1)
+            self.random_forest.fit(X_train_scaled, y_train)
         
         # Save models
         joblib.dump(self.isolation_forest, 'models/isolation_forest.pkl')
@@ -336,10 +781,15 @@ class FraudDetectionEngine:
         self.logger.info("Fraud detection models trained and saved successfully")
 
     def save_fraud_report(self, farmer_id, fraud_analysis, blockchain_hash):
-        """Save fraud analysis report to blockchain and database"""
+        """
+        Save fraud analysis report to blockchain and database
+        
+        Returns the report dict; analysis_timestamp is a datetime, so encode the
+        report with serialize_fraud_report rather than json.dumps
+        """
         report = {
             'farmer_id': farmer_id,
-            'analysis_timestamp': datetime.now().isoformat(),
+            'analysis_timestamp': datetime.now(),
             'fraud_score': fraud_analysis['fraud_score'],
             'risk_level': fraud_analysis['risk_level'],
             'fraud_indicators': fraud_analysis['fraud_indicators'],
@@ -352,4 +802,12 @@ class FraudDetectionEngine:
         
         self.logger.info(f"Fraud report saved for farmer {farmer_id} with risk level {fraud_analysis['risk_level']}")
         
-        return report
\ No newline at end of file
+        return report
+
+    def serialize_fraud_report(self, report):
+        """Serialize a fraud report to JSON bytes (datetimes as ISO 8601, numpy values natively)"""
+        if orjson is not None:
+            return orjson.dumps(report, option=orjson.OPT_SERIALIZE_NUMPY)
+        # Compact, unescaped UTF-8 so the bytes match orjson's output
+        return json.dumps(report, default=_json_default, separators=(',', ':'),
+                          ensure_ascii=False).encode('utf-8')
\ No newline at end of file